@@ -65,6 +65,9 @@ def setup_periodic_tasks(sender, **kwargs):
 
     sender.add_periodic_task(crontab(day_of_week="fri", hour=0, minute=0), clean_stale_partials.s())
 
+    # delete expired organization invites nightly, keeping the invite table bounded
+    sender.add_periodic_task(crontab(hour=3, minute=0), delete_expired_invites.s())
+
     sender.add_periodic_task(90, check_cached_items.s(), name="check dashboard items")
 
     if is_ee_enabled():
@@ -185,6 +188,14 @@ def clean_stale_partials():
     Partial.objects.filter(timestamp__lt=timezone.now() - timezone.timedelta(7)).delete()
 
 
+@app.task(ignore_result=True)
+def delete_expired_invites():
+    """Purge expired organization invites, so active_invites queries scan a bounded table."""
+    from posthog.models.organization import INVITE_VALIDITY_TD, OrganizationInvite
+
+    OrganizationInvite.objects.filter(created_at__lt=timezone.now() - INVITE_VALIDITY_TD).delete()
+
+
 @app.task(ignore_result=True)
 def status_report():
     from posthog.tasks.status_report import status_report
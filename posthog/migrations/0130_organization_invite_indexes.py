@@ -0,0 +1,17 @@
+from django.contrib.postgres.operations import AddIndexConcurrently  # type: ignore
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("posthog", "0129_merge_20210223_0757"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="organizationinvite",
+            index=models.Index(fields=["organization", "-created_at"], name="invite_org_created_idx"),
+        ),
+    ]
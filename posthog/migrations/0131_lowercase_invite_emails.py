@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posthog", "0130_organization_invite_indexes"),
+    ]
+
+    operations = [
+        # Invites created before emails were normalized on save kept their original case, which the
+        # equality-based cleanup in OrganizationInvite.use() would no longer match - lowercase them all
+        migrations.RunSQL(
+            sql=(
+                "UPDATE posthog_organizationinvite SET target_email = LOWER(target_email) "
+                "WHERE target_email <> LOWER(target_email)"
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional, Tuple
+import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
@@ -6,10 +7,9 @@ from django.db import models, transaction
 from django.db.models.query import QuerySet
 from django.dispatch import receiver
 from django.utils import timezone
+from django.utils.functional import cached_property
 from rest_framework import exceptions
 
-from posthog.utils import mask_email_address
-
 from .utils import UUIDModel, sane_repr
 
 try:
@@ -19,11 +19,30 @@ except ImportError:
 
 
 INVITE_DAYS_VALIDITY = 3  # number of days for which team invites are valid
+INVITE_VALIDITY_TD = timezone.timedelta(days=INVITE_DAYS_VALIDITY)  # precomputed, as it's needed per invite checked
+
+# Whether EE code is present never changes within a process, so pick the license lookup
+# implementation once at import time instead of re-checking License on every call
+if License is None:
+
+    def _first_valid_license() -> Optional[Any]:
+        return None
+
+
+else:
+
+    def _first_valid_license() -> Optional[Any]:
+        return License.objects.first_valid()
 
 
 class OrganizationManager(models.Manager):
     def bootstrap(
-        self, user: Any, *, team_fields: Optional[Dict[str, Any]] = None, **kwargs,
+        self,
+        user: Any,
+        *,
+        team_fields: Optional[Dict[str, Any]] = None,
+        extra_users: Optional[List[Any]] = None,
+        **kwargs,
     ) -> Tuple["Organization", Optional["OrganizationMembership"], Any]:
         """Instead of doing the legwork of creating an organization yourself, delegate the details with bootstrap."""
         from .team import Team  # Avoiding circular import
@@ -38,9 +57,41 @@ class OrganizationManager(models.Manager):
                 )
                 user.current_organization = organization
                 user.current_team = team
-                user.save()
+                user.save(update_fields=["current_organization", "current_team"])
+            if extra_users:
+                # One multi-row INSERT instead of a round-trip per member; conflicts (duplicates in the
+                # batch, or the bootstrapping user itself) are skipped instead of aborting the transaction
+                OrganizationMembership.objects.bulk_create(
+                    [
+                        OrganizationMembership(
+                            organization=organization, user=extra_user, level=OrganizationMembership.Level.MEMBER,
+                        )
+                        for extra_user in extra_users
+                    ],
+                    batch_size=500,
+                    ignore_conflicts=True,
+                )
         return organization, organization_membership, team
 
+    def with_related(self) -> QuerySet:
+        """Organizations with members and active invites eagerly loaded, for use in list endpoints.
+
+        Collapses the per-organization member and invite queries of a list page into a constant
+        number of queries; consumers read the prefetched _active_invites list instead of the
+        active_invites property. Where the billing relation exists (Cloud), it's joined in as well.
+        """
+        queryset = self.prefetch_related(
+            "memberships__user",
+            models.Prefetch(
+                "invites",
+                queryset=OrganizationInvite.objects.filter(created_at__gte=timezone.now() - INVITE_VALIDITY_TD),
+                to_attr="_active_invites",
+            ),
+        )
+        if hasattr(Organization, "billing"):  # Only the Cloud codebase defines the billing relation
+            queryset = queryset.select_related("billing")
+        return queryset
+
 
 class Organization(UUIDModel):
     members: models.ManyToManyField = models.ManyToManyField(
@@ -57,6 +108,9 @@ class Organization(UUIDModel):
 
     objects = OrganizationManager()
 
+    # Set by the Prefetch in OrganizationManager.with_related
+    _active_invites: List["OrganizationInvite"]
+
     def __str__(self):
         return self.name
 
@@ -66,27 +120,40 @@ class Organization(UUIDModel):
     def _billing_plan_details(self) -> Tuple[Optional[str], Optional[str]]:
         """
         Obtains details on the billing plan for the organization.
-        Returns a tuple with (billing_plan_key, billing_realm)
+        Returns a tuple with (billing_plan_key, billing_realm).
+        Memoized per instance, as billing_plan, available_features and is_feature_available
+        all read this repeatedly within a single request.
         """
+        try:
+            return self._billing_plan_details_cache
+        except AttributeError:
+            pass
 
+        details: Tuple[Optional[str], Optional[str]] = (None, None)
         # If on Cloud, grab the organization's price
-        if hasattr(self, "billing"):
-            if self.billing is None:  # type: ignore
-                return (None, None)
-            return (self.billing.get_plan_key(), "cloud")  # type: ignore
-
-        # Otherwise, try to find a valid license on this instance
-        if License is not None:
-            license = License.objects.first_valid()
+        # Note: viewsets listing organizations on Cloud should .select_related("billing")
+        # so that this resolves from the row already fetched instead of querying per organization
+        try:
+            billing = self.billing  # type: ignore
+        except AttributeError:
+            # Either not on Cloud (the relation isn't defined at all) or on Cloud with no billing
+            # record for this organization - RelatedObjectDoesNotExist subclasses AttributeError
+            billing = None
+        if billing is not None:
+            details = (billing.get_plan_key(), "cloud")
+        else:
+            # Otherwise, try to find a valid license on this instance
+            license = _first_valid_license()
             if license:
-                return (license.plan, "ee")
-        return (None, None)
+                details = (license.plan, "ee")
+        self._billing_plan_details_cache = details
+        return details
 
     @property
     def billing_plan(self) -> Optional[str]:
         return self._billing_plan_details[0]
 
-    @property
+    @cached_property
     def available_features(self) -> List[str]:
         plan, realm = self._billing_plan_details
         if not plan:
@@ -95,8 +162,13 @@ class Organization(UUIDModel):
             return License.PLANS.get(plan, [])
         return self.billing.available_features  # type: ignore
 
+    @cached_property
+    def _available_features_set(self) -> FrozenSet[str]:
+        return frozenset(self.available_features)
+
     def is_feature_available(self, feature: str) -> bool:
-        return feature in self.available_features
+        # Set membership, so repeated feature gating checks stay O(1)
+        return feature in self._available_features_set
 
     @property
     def is_onboarding_active(self) -> bool:
@@ -104,11 +176,14 @@ class Organization(UUIDModel):
 
     @property
     def active_invites(self) -> QuerySet:
-        return self.invites.filter(created_at__gte=timezone.now() - timezone.timedelta(days=INVITE_DAYS_VALIDITY))
+        # Note: when listing many organizations, prefer OrganizationManager.with_related and read the
+        # prefetched _active_invites list directly instead of evaluating this query per organization
+        return self.invites.filter(created_at__gte=timezone.now() - INVITE_VALIDITY_TD)
 
     def complete_onboarding(self) -> "Organization":
+        # A narrow UPDATE instead of self.save(), which would write every column and fire save signals
+        Organization.objects.filter(pk=self.pk).update(setup_section_2_completed=True)
         self.setup_section_2_completed = True
-        self.save()
         return self
 
 
@@ -141,37 +216,92 @@ class OrganizationMembership(UUIDModel):
             ),
         ]
 
+    # Materialized once, as __str__ is called per row in admin lists and logging
+    _LEVEL_NAMES = {level.value: str(level) for level in Level}
+
     def __str__(self):
-        return str(self.Level(self.level))
+        return self._LEVEL_NAMES[self.level]
+
+    # Precomputed at module load from _membership_update_denial - see the bottom of this module
+    _UPDATE_RULES: Dict[Tuple[int, int, bool, bool, Optional[int]], Optional[str]]
+
+    @classmethod
+    def fetch_pair(cls, actor_id: Any, target_id: Any) -> Dict[Any, "OrganizationMembership"]:
+        """Fetch two memberships (with organization and user joined in) in a single query, keyed by ID.
+
+        Callers of validate_update that have the two membership IDs should use this
+        instead of two separate get() calls.
+        """
+        return {
+            membership.id: membership
+            for membership in cls.objects.select_related("organization", "user").filter(id__in=[actor_id, target_id])
+        }
 
     def validate_update(
         self, membership_being_updated: "OrganizationMembership", new_level: Optional[Level] = None
     ) -> None:
-        if new_level is not None:
-            if membership_being_updated.id == self.id:
-                raise exceptions.PermissionDenied("You can't change your own access level.")
-            if new_level == OrganizationMembership.Level.OWNER:
-                if self.level != OrganizationMembership.Level.OWNER:
-                    raise exceptions.PermissionDenied(
-                        "You can only pass on organization ownership if you're its owner."
-                    )
-                self.level = OrganizationMembership.Level.ADMIN
-                self.save()
-            elif new_level > self.level:
-                raise exceptions.PermissionDenied(
-                    "You can only change access level of others to lower or equal to your current one."
-                )
-        if membership_being_updated.id != self.id:
-            if membership_being_updated.organization_id != self.organization_id:
-                raise exceptions.PermissionDenied("You both need to belong to the same organization.")
-            if self.level < OrganizationMembership.Level.ADMIN:
-                raise exceptions.PermissionDenied("You can only edit others if you are an admin.")
-            if membership_being_updated.level > self.level:
-                raise exceptions.PermissionDenied("You can only edit others with level lower or equal to you.")
+        """Validate a level change to membership_being_updated, attempted by this (the actor's) membership.
+
+        When both memberships need fetching first, use fetch_pair to get them in one query.
+        """
+        key = (
+            self.level,
+            membership_being_updated.level,
+            membership_being_updated.id == self.id,
+            membership_being_updated.organization_id == self.organization_id,
+            None if new_level is None else int(new_level),
+        )
+        try:
+            denial_reason = self._UPDATE_RULES[key]
+        except KeyError:  # a level outside of Level choices - evaluate the rules directly
+            denial_reason = _membership_update_denial(*key)
+        if denial_reason is not None:
+            raise exceptions.PermissionDenied(denial_reason)
+        if new_level == OrganizationMembership.Level.OWNER:
+            # Ownership is being transferred - the current owner steps down to admin
+            self.level = OrganizationMembership.Level.ADMIN
+            self.save(update_fields=["level", "updated_at"])
 
     __repr__ = sane_repr("organization", "user", "level")
 
 
+def _membership_update_denial(
+    actor_level: int, target_level: int, same_member: bool, same_organization: bool, new_level: Optional[int]
+) -> Optional[str]:
+    """Determine why a membership update should be denied (None meaning it's allowed).
+
+    Only used to precompute OrganizationMembership._UPDATE_RULES, which validate_update reads per call.
+    """
+    if new_level is not None:
+        if same_member:
+            return "You can't change your own access level."
+        if new_level == OrganizationMembership.Level.OWNER:
+            if actor_level != OrganizationMembership.Level.OWNER:
+                return "You can only pass on organization ownership if you're its owner."
+        elif new_level > actor_level:
+            return "You can only change access level of others to lower or equal to your current one."
+    if not same_member:
+        if not same_organization:
+            return "You both need to belong to the same organization."
+        if actor_level < OrganizationMembership.Level.ADMIN:
+            return "You can only edit others if you are an admin."
+        if target_level > actor_level:
+            return "You can only edit others with level lower or equal to you."
+    return None
+
+
+OrganizationMembership._UPDATE_RULES = {
+    (actor_level, target_level, same_member, same_organization, new_level): _membership_update_denial(
+        actor_level, target_level, same_member, same_organization, new_level
+    )
+    for actor_level in OrganizationMembership.Level.values
+    for target_level in OrganizationMembership.Level.values
+    for same_member in (False, True)
+    for same_organization in (False, True)
+    for new_level in (None, *OrganizationMembership.Level.values)
+}
+
+
 class OrganizationInvite(UUIDModel):
     organization: models.ForeignKey = models.ForeignKey(
         "posthog.Organization", on_delete=models.CASCADE, related_name="invites", related_query_name="invite",
@@ -189,29 +319,54 @@ class OrganizationInvite(UUIDModel):
     created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
     updated_at: models.DateTimeField = models.DateTimeField(auto_now=True)
 
-    def validate(self, *, user: Any = None, email: Optional[str] = None) -> None:
+    class Meta:
+        indexes = [
+            # Serves the created_at range scan in Organization.active_invites
+            models.Index(fields=["organization", "-created_at"], name="invite_org_created_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Normalize on write so use() can delete by plain (indexed) equality instead of iexact
+        if self.target_email:
+            self.target_email = self.target_email.lower()
+        super().save(*args, **kwargs)
+
+    def validate(
+        self, *, user: Any = None, email: Optional[str] = None, now: Optional[datetime.datetime] = None
+    ) -> None:
+        """Validate that the invite can be used by user/email.
+
+        Bulk flows validating many invites should pass a shared now snapshot, so that expiry
+        is checked consistently across the batch with a single timezone.now() call.
+        """
         _email = email or (hasattr(user, "email") and user.email)
 
-        if _email and _email != self.target_email:
+        if _email and _email.lower() != (self.target_email or "").lower():
+            from posthog.utils import mask_email_address  # Deferred, as it's only needed on this unhappy path
+
             raise exceptions.ValidationError(
                 f"This invite is intended for another email address: {mask_email_address(self.target_email)}"
                 f". You tried to sign up with {_email}.",
                 code="invalid_recipient",
             )
 
-        if self.is_expired():
+        if self.is_expired(now=now):
             raise exceptions.ValidationError(
                 "This invite has expired. Please ask your admin for a new one.", code="expired",
             )
 
-        if OrganizationMembership.objects.filter(organization=self.organization, user=user).exists():
-            raise exceptions.ValidationError(
-                "You already are a member of this organization.", code="user_already_member",
-            )
-
-        if OrganizationMembership.objects.filter(
-            organization=self.organization, user__email=self.target_email,
-        ).exists():
+        # Single round-trip covering both the "user already a member" and "email already taken" checks
+        member_user_ids = list(
+            OrganizationMembership.objects.filter(organization_id=self.organization_id)
+            # iexact, as target_email is normalized to lowercase while User.email keeps its original case
+            .filter(models.Q(user=user) | models.Q(user__email__iexact=self.target_email))
+            .values_list("user_id", flat=True)
+        )
+        if member_user_ids:
+            if user is not None and user.id in member_user_ids:
+                raise exceptions.ValidationError(
+                    "You already are a member of this organization.", code="user_already_member",
+                )
             raise exceptions.ValidationError(
                 "Another user with this email address already belongs to this organization.",
                 code="existing_email_address",
@@ -221,11 +376,14 @@ class OrganizationInvite(UUIDModel):
         if not prevalidated:
             self.validate(user=user)
         user.join(organization=self.organization)
-        OrganizationInvite.objects.filter(target_email__iexact=self.target_email).delete()
+        target_email = self.target_email.lower() if self.target_email else None
+        OrganizationInvite.objects.filter(target_email=target_email).delete()
 
-    def is_expired(self) -> bool:
+    def is_expired(self, *, now: Optional[datetime.datetime] = None) -> bool:
         """Check if invite is older than INVITE_DAYS_VALIDITY days."""
-        return self.created_at < timezone.now() - timezone.timedelta(INVITE_DAYS_VALIDITY)
+        if now is None:
+            now = timezone.now()
+        return self.created_at < now - INVITE_VALIDITY_TD
 
     def __str__(self):
         return f"{settings.SITE_URL}/signup/{self.id}"
@@ -235,14 +393,21 @@ class OrganizationInvite(UUIDModel):
 
 @receiver(models.signals.pre_delete, sender=OrganizationMembership)
 def ensure_organization_membership_consistency(sender, instance: OrganizationMembership, **kwargs):
-    save_user = False
-    if instance.user.current_organization == instance.organization:
+    from .user import User  # Avoiding circular import
+
+    # Fetch the user with their current team joined in, so the checks below don't query once per attribute walk
+    user = (
+        User.objects.select_related("current_team")
+        .only("id", "current_organization", "current_team__organization")
+        .get(pk=instance.user_id)
+    )
+    reset_fields: Dict[str, None] = {}
+    if user.current_organization_id == instance.organization_id:
         # reset current_organization if it's the removed organization
-        instance.user.current_organization = None
-        save_user = True
-    if instance.user.current_team is not None and instance.user.current_team.organization == instance.organization:
+        reset_fields["current_organization"] = None
+    if user.current_team is not None and user.current_team.organization_id == instance.organization_id:
         # reset current_team if it belongs to the removed organization
-        instance.user.current_team = None
-        save_user = True
-    if save_user:
-        instance.user.save()
+        reset_fields["current_team"] = None
+    if reset_fields:
+        # a raw UPDATE of just the affected columns, instead of a save() that writes the whole row
+        User.objects.filter(pk=user.pk).update(**reset_fields)
@@ -0,0 +1,18 @@
+from django.utils import timezone
+
+from posthog.celery import delete_expired_invites
+from posthog.models import OrganizationInvite
+from posthog.test.base import BaseTest
+
+
+class TestDeleteExpiredInvites(BaseTest):
+    def test_delete_expired_invites(self) -> None:
+        active_invite = OrganizationInvite.objects.create(organization=self.organization)
+        expired_invite = OrganizationInvite.objects.create(organization=self.organization)
+        OrganizationInvite.objects.filter(id=expired_invite.id).update(
+            created_at=timezone.now() - timezone.timedelta(hours=73),
+        )
+
+        delete_expired_invites()
+
+        self.assertEqual(list(OrganizationInvite.objects.all()), [active_invite])
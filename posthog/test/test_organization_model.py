@@ -1,10 +1,29 @@
 from django.utils import timezone
 
-from posthog.models import OrganizationInvite
+from posthog.models import Organization, OrganizationInvite, OrganizationMembership, User
 from posthog.test.base import BaseTest
 
 
 class TestOrganization(BaseTest):
+    def test_bootstrap_with_extra_users(self):
+        extra_user_1 = User.objects.create(email="extra1@posthog.com")
+        extra_user_2 = User.objects.create(email="extra2@posthog.com")
+
+        organization, _, _ = Organization.objects.bootstrap(
+            self.user, name="X", extra_users=[extra_user_1, extra_user_2, extra_user_2, self.user],
+        )
+
+        # The duplicate extra_user_2 and the already-added bootstrapping user are skipped, not errors
+        self.assertEqual(OrganizationMembership.objects.filter(organization=organization).count(), 3)
+        self.assertEqual(
+            OrganizationMembership.objects.get(organization=organization, user=self.user).level,
+            OrganizationMembership.Level.OWNER,
+        )
+        self.assertEqual(
+            OrganizationMembership.objects.get(organization=organization, user=extra_user_1).level,
+            OrganizationMembership.Level.MEMBER,
+        )
+
     def test_organization_active_invites(self):
         self.assertEqual(self.organization.invites.count(), 0)
         self.assertEqual(self.organization.active_invites.count(), 0)
@@ -19,3 +38,39 @@ class TestOrganization(BaseTest):
         )
         self.assertEqual(self.organization.invites.count(), 2)
         self.assertEqual(self.organization.active_invites.count(), 1)
+
+    def test_with_related_prefetches_active_invites(self):
+        OrganizationInvite.objects.create(organization=self.organization)
+        expired_invite = OrganizationInvite.objects.create(organization=self.organization)
+        OrganizationInvite.objects.filter(id=expired_invite.id).update(
+            created_at=timezone.now() - timezone.timedelta(hours=73),
+        )
+
+        organization = Organization.objects.with_related().get(id=self.organization.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(len(organization._active_invites), 1)
+        # the property keeps its QuerySet interface regardless of prefetching
+        self.assertEqual(organization.active_invites.count(), 1)
+
+    def test_membership_fetch_pair(self):
+        other_user = User.objects.create(email="other@posthog.com")
+        other_membership = OrganizationMembership.objects.create(organization=self.organization, user=other_user)
+
+        with self.assertNumQueries(1):
+            pair = OrganizationMembership.fetch_pair(self.organization_membership.id, other_membership.id)
+            self.assertEqual(
+                pair,
+                {
+                    self.organization_membership.id: self.organization_membership,
+                    other_membership.id: other_membership,
+                },
+            )
+            # organization and user come joined in, at no extra query cost
+            self.assertEqual(pair[other_membership.id].organization, self.organization)
+            self.assertEqual(pair[other_membership.id].user, other_user)
+
+        # an actor targeting themselves collapses to a single entry
+        self.assertEqual(
+            list(OrganizationMembership.fetch_pair(other_membership.id, other_membership.id)), [other_membership.id],
+        )